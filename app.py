@@ -3,20 +3,28 @@
 Breaking News Chatbot MVP - Single File
 Fetches news, processes with Gemini, serves chat UI via Kafka
 """
-import json
+import asyncio
+import hashlib
 import os
+import re
 import time
 import threading
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
 from config import NEWSAPI_KEY, GOOGLE_API_KEY, KAFKA_SERVERS, FETCH_INTERVAL, EMBEDDING_MODEL
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from pydantic import BaseModel
 from sentence_transformers import SentenceTransformer
 import numpy as np
+import torch
 
 # Try to import Kafka and Pathway, but make them optional
 try:
@@ -33,9 +41,192 @@ except ImportError:
     print("⚠️  Pathway not available - running in simplified mode")
     PATHWAY_AVAILABLE = False
 
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    print("⚠️  Numba not available - using NumPy similarity grouping")
+    NUMBA_AVAILABLE = False
+
 # Global state
-news_index = []  # List of {text, url, embedding}
-model = SentenceTransformer(EMBEDDING_MODEL)
+
+# Shared HTTP session so NewsAPI polls reuse keep-alive TLS connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+))
+
+device = "cuda" if torch.cuda.is_available() else "cpu"
+model = SentenceTransformer(EMBEDDING_MODEL, device=device)
+if device == "cuda":
+    model.half()  # fp16 on GPU halves memory bandwidth and uses tensor cores
+
+# In-memory index stored as a ring buffer of quantized embeddings; item metadata lives in _snapshot
+MAX_ITEMS = 100
+EMBEDDING_DIM = model.get_sentence_embedding_dimension()  # 384 for MiniLM
+embeddings_matrix = np.zeros((MAX_ITEMS, EMBEDDING_DIM), dtype=np.int8)  # Quantized, scale 1/127
+n_items = 0  # Total items ever indexed; the next write goes to slot n_items % MAX_ITEMS
+_latest_bytes = b"[]"  # Pre-serialized /latest payload, rebuilt on write
+
+# Copy-on-write view for readers: (n_items at publish time, tuple of items oldest first).
+# Writers serialize on _INDEX_LOCK and swap the reference; metadata readers never lock.
+# embeddings_matrix rows are overwritten in place, so copying rows takes the lock briefly.
+_snapshot = (0, ())
+_INDEX_LOCK = threading.Lock()
+
+def quantize(vec: np.ndarray) -> np.ndarray:
+    """Quantize a normalized embedding to int8 with a fixed scale of 127"""
+    return np.clip(np.round(vec * 127), -127, 127).astype(np.int8)
+
+def add_to_index(news_items, embeddings):
+    """Write items into the next ring buffer slots (overwriting the oldest) and publish a new snapshot"""
+    global n_items, _snapshot
+    with _INDEX_LOCK:
+        for news_item, embedding in zip(news_items, embeddings):
+            slot = n_items % MAX_ITEMS
+            embeddings_matrix[slot] = quantize(embedding)
+            n_items += 1
+        
+        _snapshot = (n_items, (_snapshot[1] + tuple(news_items))[-MAX_ITEMS:])
+        refresh_latest_payload()
+
+def _to_iso(ts) -> str:
+    """Format an epoch timestamp for the browser (Kafka messages may already carry ISO strings)"""
+    if isinstance(ts, (int, float)):
+        return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+    return ts
+
+def refresh_latest_payload():
+    """Re-serialize the 10 most recent items once per write instead of on every /latest request"""
+    global _latest_bytes
+    _latest_bytes = orjson.dumps([
+        {**item, "fetched_at": _to_iso(item["fetched_at"]), "processed_at": _to_iso(item["processed_at"])}
+        for item in recent_news(10)
+    ])
+
+def recent_window(k: int) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """Return the k most recently indexed items and their ring buffer slots, oldest first"""
+    end, items = _snapshot  # Single reference read - consistent even while a writer swaps
+    items = items[-k:] if k else ()
+    return list(items), [i % MAX_ITEMS for i in range(end - len(items), end)]
+
+def recent_news(k: int) -> List[Dict[str, Any]]:
+    """Return the k most recently indexed items, oldest first"""
+    return recent_window(k)[0]
+
+def recent_embeddings(k: int) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+    """Return the k most recent items and a copy of their int8 embedding rows, oldest first"""
+    with _INDEX_LOCK:  # No writer can overwrite a row between reading the window and copying it
+        items, slots = recent_window(k)
+        return items, embeddings_matrix[slots]
+
+def get_topk(query_vec: np.ndarray, k: int = 5) -> List[Dict[str, Any]]:
+    """Return the k indexed items most similar to a normalized query embedding"""
+    items, rows = recent_embeddings(MAX_ITEMS)
+    if not items:
+        return []
+    k = min(k, len(items))
+    # Accumulate in int32: 384 products of up to 127*127 overflow int16
+    scores = (rows.astype(np.int32) @ quantize(query_vec).astype(np.int32)).astype(np.float32) / (127 * 127)
+    idx = np.argpartition(-scores, k - 1)[:k]
+    idx = idx[np.argsort(-scores[idx])]
+    return [{**items[i], "score": float(scores[i])} for i in idx]
+
+# Similarity grouping for the /summary fallback
+SIM_GROUP_THRESHOLD = 0.6  # Min cosine similarity to join a cluster leader
+
+def _leader_clusters(sims: np.ndarray, thr: float) -> np.ndarray:
+    """Single-pass leader clustering: each item joins the first leader within thr, else leads a new cluster"""
+    n = sims.shape[0]
+    labels = np.full(n, -1, dtype=np.int64)
+    leaders = np.empty(n, dtype=np.int64)
+    n_leaders = 0
+    for i in range(n):
+        for c in range(n_leaders):
+            if sims[i, leaders[c]] >= thr:
+                labels[i] = c
+                break
+        if labels[i] == -1:
+            leaders[n_leaders] = i
+            labels[i] = n_leaders
+            n_leaders += 1
+    return labels
+
+if NUMBA_AVAILABLE:
+    _leader_clusters = numba.njit(fastmath=True)(_leader_clusters)
+    
+    @numba.njit(parallel=True, fastmath=True)
+    def _pairwise_sims(emb: np.ndarray) -> np.ndarray:
+        n, dim = emb.shape
+        sims = np.empty((n, n), dtype=np.float32)
+        for i in numba.prange(n):
+            for j in range(n):
+                acc = np.float32(0.0)
+                for d in range(dim):
+                    acc += emb[i, d] * emb[j, d]
+                sims[i, j] = acc
+        return sims
+else:
+    def _pairwise_sims(emb: np.ndarray) -> np.ndarray:
+        return emb @ emb.T
+
+def _group_by_sim(emb: np.ndarray, thr: float) -> np.ndarray:
+    """Cluster label per row of a normalized (N, dim) float32 embedding matrix"""
+    return _leader_clusters(_pairwise_sims(np.ascontiguousarray(emb)), thr)
+
+# SIM-LRU embedding cache: republished wire stories reuse a cached embedding
+SIM_CACHE_SIZE = 512
+SIM_THRESHOLD = 0.05  # Max cosine distance for a near-duplicate hit
+sim_keys = np.zeros((SIM_CACHE_SIZE, EMBEDDING_DIM), dtype=np.float32)
+sim_hashes = {}  # Text digest -> row in sim_keys
+sim_lru = OrderedDict()  # Row -> digests aliased to it, least recently used first
+_SIM_LOCK = threading.Lock()
+
+def _sim_insert(digest: bytes, vec: np.ndarray) -> np.ndarray:
+    """Add a fresh embedding to the cache, collapsing it onto a near-duplicate row if one exists"""
+    n_valid = len(sim_lru)
+    if n_valid:
+        scores = sim_keys[:n_valid] @ vec
+        best = int(scores.argmax())
+        if 1.0 - scores[best] <= SIM_THRESHOLD:
+            sim_hashes[digest] = best
+            sim_lru[best].append(digest)
+            sim_lru.move_to_end(best)
+            return sim_keys[best]
+    
+    if n_valid < SIM_CACHE_SIZE:
+        row = n_valid
+    else:
+        row, evicted = sim_lru.popitem(last=False)
+        for old_digest in evicted:
+            sim_hashes.pop(old_digest, None)
+    sim_keys[row] = vec
+    sim_hashes[digest] = row
+    sim_lru[row] = [digest]
+    return sim_keys[row]
+
+def encode_cached(texts: List[str]) -> np.ndarray:
+    """Embed texts, running the transformer only on texts not already in the SIM-LRU cache"""
+    digests = [hashlib.blake2b(text.encode("utf-8")).digest() for text in texts]
+    embeddings = np.empty((len(texts), EMBEDDING_DIM), dtype=np.float32)
+    misses = []
+    with _SIM_LOCK:
+        for i, digest in enumerate(digests):
+            row = sim_hashes.get(digest)
+            if row is None:
+                misses.append(i)
+            else:
+                embeddings[i] = sim_keys[row]
+                sim_lru.move_to_end(row)
+    
+    if misses:
+        fresh = model.encode([texts[i] for i in misses], batch_size=32, normalize_embeddings=True, convert_to_numpy=True)
+        with _SIM_LOCK:
+            for i, vec in zip(misses, fresh.astype(np.float32)):
+                embeddings[i] = _sim_insert(digests[i], vec)
+    return embeddings
 
 # Pathway schema for news processing (only if Pathway is available)
 def create_pathway_pipeline():
@@ -62,15 +253,17 @@ def create_pathway_pipeline():
             autocommit_duration_ms=1000,
         )
         
-        # Add embeddings using Pathway
-        def embed_text(text: str) -> List[float]:
-            if not text:
-                return [0.0] * 384  # Default embedding size
+        # Add embeddings using Pathway - batched UDF, up to 32 summaries per encode call
+        @pw.udf(deterministic=True, max_batch_size=32, return_type=List[float])
+        def embed_text(texts: List[str]) -> List[List[float]]:
+            embeddings = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)  # Empty text -> zero vector
+            non_empty = [i for i, text in enumerate(texts) if text]
             try:
-                embedding = model.encode([text], normalize_embeddings=True)[0]
-                return embedding.tolist()
-            except:
-                return [0.0] * 384
+                if non_empty:
+                    embeddings[non_empty] = encode_cached([texts[i] for i in non_empty])
+            except Exception as e:
+                print(f"❌ Pathway embedding error: {e}")
+            return embeddings.tolist()
         
         # Process and add embeddings
         with_embeddings = news_stream.select(
@@ -79,7 +272,7 @@ def create_pathway_pipeline():
             summary=news_stream.summary,
             publishedAt=news_stream.publishedAt,
             fetched_at=news_stream.fetched_at,
-            embedding=pw.apply(embed_text, news_stream.summary),
+            embedding=embed_text(news_stream.summary),
         )
         
         # Write processed news to a new topic
@@ -96,7 +289,7 @@ def create_pathway_pipeline():
         return None
 
 # FastAPI app
-app = FastAPI(title="Breaking News Summary")
+app = FastAPI(title="Breaking News Summary", default_response_class=ORJSONResponse)
 
 # Kafka setup (only if Kafka is available)
 def get_producer():
@@ -130,7 +323,7 @@ def fetch_news():
     try:
         url = "https://newsapi.org/v2/top-headlines"
         params = {"apiKey": NEWSAPI_KEY, "country": "us", "pageSize": 20}
-        response = requests.get(url, params=params, timeout=10)
+        response = _SESSION.get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         return data.get("articles", [])
@@ -139,74 +332,127 @@ def fetch_news():
         return []
 
 # Gemini summarization
-def summarize_with_gemini(text: str) -> str:
-    """Summarize text using Google Gemini API"""
-    if not GOOGLE_API_KEY or not text:
-        return ""
+_GEMINI_MODEL = None
+_GEMINI_LOCK = threading.Lock()
+
+def _get_gemini():
+    """Configure the Gemini client once and reuse it across calls"""
+    global _GEMINI_MODEL
+    if _GEMINI_MODEL is None:
+        with _GEMINI_LOCK:
+            if _GEMINI_MODEL is None:
+                import google.generativeai as genai
+                genai.configure(api_key=GOOGLE_API_KEY)
+                _GEMINI_MODEL = genai.GenerativeModel("gemini-1.5-flash")
+    return _GEMINI_MODEL
+
+# Gemini summaries keyed by a hash of the article text (syndicated stories hit the cache)
+GEMINI_CACHE_SIZE = 1024
+_gemini_summaries = OrderedDict()
+_GEMINI_CACHE_LOCK = threading.Lock()
+
+def summarize_batch_with_gemini(texts: List[str]) -> List[str]:
+    """Summarize many articles with a single Gemini call; "" for any article without a summary"""
+    summaries = [""] * len(texts)
+    if not GOOGLE_API_KEY or not texts:
+        return summaries
+    
+    texts = [text[:4000] for text in texts]
+    digests = [hashlib.blake2b(text.encode("utf-8")).digest() for text in texts]
+    misses = []
+    with _GEMINI_CACHE_LOCK:
+        for i, digest in enumerate(digests):
+            if digest in _gemini_summaries:
+                summaries[i] = _gemini_summaries[digest]
+                _gemini_summaries.move_to_end(digest)
+            elif texts[i]:
+                misses.append(i)
+    if not misses:
+        return summaries
     
     try:
-        import google.generativeai as genai
-        genai.configure(api_key=GOOGLE_API_KEY)
-        model = genai.GenerativeModel("gemini-1.5-flash")
-        
-        prompt = f"Summarize this news article in 2-3 sentences:\n\n{text[:4000]}"
-        response = model.generate_content(prompt)
-        return response.text.strip()
+        prompt = "For each item below, return a JSON list of 2-3 sentence summaries in the same order:\n" + "\n---\n".join(
+            f"[{n}] {texts[i]}" for n, i in enumerate(misses)
+        )
+        response = _get_gemini().generate_content(prompt, generation_config={"response_mime_type": "application/json"})
+        generated = orjson.loads(response.text)
+        if not isinstance(generated, list) or len(generated) != len(misses):
+            print(f"⚠️  Gemini returned {len(generated) if isinstance(generated, list) else 'no'} summaries for {len(misses)} articles")
+            return summaries
     except Exception as e:
         print(f"Gemini error: {e}")
-        return ""
+        return summaries
+    
+    with _GEMINI_CACHE_LOCK:
+        for i, summary in zip(misses, generated):
+            if isinstance(summary, str) and summary.strip():
+                summaries[i] = summary.strip()
+                _gemini_summaries[digests[i]] = summaries[i]
+        while len(_gemini_summaries) > GEMINI_CACHE_SIZE:
+            _gemini_summaries.popitem(last=False)
+    return summaries
+
+_SENT_RE = re.compile(r'(?<=[.!?])\s+')
 
 def simple_summarize(text: str) -> str:
     """Simple fallback summarization"""
     if not text:
         return ""
-    sentences = [s.strip() for s in text.split('.') if s.strip()]
-    return '. '.join(sentences[:3])
+    # maxsplit stops the scan after the first 3 sentence boundaries
+    parts = _SENT_RE.split(text, maxsplit=3)
+    return ' '.join(p.strip() for p in islice(parts, 3) if p.strip())
+
+def article_text(article_data) -> str:
+    """Combine title and description for summarization"""
+    return f"{article_data.get('title', '')}. {article_data.get('description', '')}".strip()
 
-def process_article_directly(article_data):
-    """Process article directly when Kafka is not available"""
+def prepare_article(article_data, gemini_summary: str = ""):
+    """Build an article's index entry (embedding added later in batch)"""
+    title = article_data.get("title", "")
+    url = article_data.get("url", "")
+    fetched_at = article_data.get("fetched_at", "")
+    
+    summary = gemini_summary or simple_summarize(article_text(article_data))
+    
+    news_item = {
+        "text": summary,
+        "url": url,
+        "title": title,
+        "fetched_at": fetched_at,
+        "is_realtime": article_data.get("is_realtime", False),
+    }
+    return news_item, summary
+
+def prepare_batch(articles):
+    """Summarize a batch of articles with one Gemini call (simple fallback per article)"""
+    gemini_summaries = summarize_batch_with_gemini([article_text(article) for article in articles])
+    return [prepare_article(article, summary) for article, summary in zip(articles, gemini_summaries)]
+
+def flush_batch(pending, source: str = "DIRECTLY"):
+    """Embed all pending summaries in a single encode call and add them to the index"""
+    pending = [(item, summary) for item, summary in pending if summary]
+    if not pending:
+        return
+    
     try:
-        title = article_data.get("title", "")
-        description = article_data.get("description", "")
-        url = article_data.get("url", "")
-        fetched_at = article_data.get("fetched_at", "")
-        
-        # Combine title and description for summarization
-        text = f"{title}. {description}".strip()
+        summaries = [summary for _, summary in pending]
+        embeddings = encode_cached(summaries)
+        processed_at = time.time()
         
-        # Use simple summarization to avoid Gemini quota issues
-        # Only use Gemini for every 5th article to stay within quota
-        if len(news_index) % 5 == 0:
-            summary = summarize_with_gemini(text) or simple_summarize(text)
-        else:
-            summary = simple_summarize(text)
+        news_items = [news_item for news_item, _ in pending]
+        for news_item in news_items:
+            news_item["processed_at"] = processed_at
+        add_to_index(news_items, embeddings)
         
-        if summary:
-            # Add to in-memory index
-            embedding = model.encode([summary], normalize_embeddings=True)[0]
-            news_item = {
-                "text": summary,
-                "url": url,
-                "title": title,
-                "embedding": embedding.tolist(),
-                "fetched_at": fetched_at,
-                "is_realtime": True,
-                "processed_at": datetime.utcnow().isoformat()
-            }
-            news_index.append(news_item)
-            
-            # Keep only last 100 items (most recent)
-            if len(news_index) > 100:
-                news_index.pop(0)
-            
-            print(f"✅ Indexed DIRECTLY: {title[:50]}... (fetched: {fetched_at})")
+        for news_item in news_items:
+            print(f"✅ Indexed {source}: {news_item['title'][:50]}... (fetched: {news_item['fetched_at']})")
     except Exception as e:
-        print(f"❌ Direct processor error: {e}")
+        print(f"❌ Batch embedding error: {e}")
 
 # Background workers
 def news_fetcher():
     """Background thread that continuously fetches real-time news and processes directly"""
-    seen_urls = set()
+    seen_urls = OrderedDict()  # Insertion-ordered so the oldest URLs are evicted first
     
     print("🔄 Starting real-time news fetcher...")
     
@@ -214,12 +460,15 @@ def news_fetcher():
         try:
             articles = fetch_news()
             new_articles = []
-            current_time = datetime.utcnow().isoformat()
+            current_time = time.time()
             
             for article in articles:
                 url = article.get("url", "")
                 if url and url not in seen_urls:
-                    seen_urls.add(url)
+                    seen_urls[url] = None
+                    # Keep only recent URLs to prevent memory bloat
+                    if len(seen_urls) > 1000:
+                        seen_urls.popitem(last=False)
                     article_data = {
                         "title": article.get("title", ""),
                         "description": article.get("description", ""),
@@ -229,16 +478,12 @@ def news_fetcher():
                         "is_realtime": True  # Mark as real-time data
                     }
                     new_articles.append(article_data)
-                    
-                    # Always process directly (simplified mode)
-                    process_article_directly(article_data)
             
-            if new_articles:
-                print(f"📰 Processed {len(new_articles)} NEW real-time articles directly at {current_time}")
+            # Always process directly (simplified mode): one Gemini call and one embedding batch per cycle
+            flush_batch(prepare_batch(new_articles))
             
-            # Keep only recent URLs to prevent memory bloat
-            if len(seen_urls) > 1000:
-                seen_urls = set(list(seen_urls)[-500:])
+            if new_articles:
+                print(f"📰 Processed {len(new_articles)} NEW real-time articles directly at {_to_iso(current_time)}")
             
         except Exception as e:
             print(f"❌ Fetcher error: {e}")
@@ -262,45 +507,36 @@ def news_processor():
     
     while True:
         try:
-            msg = consumer.poll(1.0)
-            if msg is None:
-                continue
-            if msg.error():
-                print(f"❌ Consumer error: {msg.error()}")
-                continue
-            
-            article = json.loads(msg.value().decode("utf-8"))
-            title = article.get("title", "")
-            description = article.get("description", "")
-            url = article.get("url", "")
-            is_realtime = article.get("is_realtime", False)
-            fetched_at = article.get("fetched_at", "")
-            
-            # Combine title and description for summarization
-            text = f"{title}. {description}".strip()
+            # Drain up to one embedding batch worth of messages per poll
+            msgs = consumer.consume(num_messages=32, timeout=1.0)
+            articles = []
+            for msg in msgs:
+                if msg.error():
+                    print(f"❌ Consumer error: {msg.error()}")
+                    continue
+                
+                # A malformed message is skipped on its own; the rest of the batch is still indexed
+                try:
+                    article = orjson.loads(msg.value())
+                    if not isinstance(article, dict):
+                        raise ValueError(f"expected a JSON object, got {type(article).__name__}")
+                    articles.append(article)
+                except Exception as e:
+                    print(f"❌ Skipping malformed message: {e}")
             
             # Summarize with Gemini or fallback
-            summary = summarize_with_gemini(text) or simple_summarize(text)
-            
-            if summary:
-                # Add to in-memory index with real-time metadata
-                embedding = model.encode([summary], normalize_embeddings=True)[0]
-                news_item = {
-                    "text": summary,
-                    "url": url,
-                    "title": title,
-                    "embedding": embedding.tolist(),
-                    "fetched_at": fetched_at,
-                    "is_realtime": is_realtime,
-                    "processed_at": datetime.utcnow().isoformat()
-                }
-                news_index.append(news_item)
-                
-                # Keep only last 100 items (most recent)
-                if len(news_index) > 100:
-                    news_index.pop(0)
-                
-                print(f"✅ Indexed REAL-TIME: {title[:50]}... (fetched: {fetched_at})")
+            try:
+                pending = prepare_batch(articles)
+            except Exception as e:
+                print(f"❌ Batch summarization error: {e}")
+                pending = []
+                for article in articles:
+                    try:
+                        pending.append(prepare_article(article))
+                    except Exception as e:
+                        print(f"❌ Skipping article: {e}")
+            
+            flush_batch(pending, source="REAL-TIME")
                 
         except Exception as e:
             print(f"❌ Processor error: {e}")
@@ -707,79 +943,101 @@ def chat_ui():
 
 # Removed QA endpoint - now using summary instead
 
+SUMMARY_CACHE_TTL = 60  # seconds
+_summary_cache = {"key": None, "text": "", "ts": 0.0}
+_summary_inflight: Dict[str, asyncio.Future] = {}  # Concurrent requests for the same items share one Gemini call
+GEMINI_SUMMARY_TIMEOUT = 30  # seconds
+
+def _generate_summary(context_text: str) -> str:
+    """Ask Gemini for a topic-organized summary of the given news context"""
+    prompt = f"""Please provide a comprehensive summary of the following breaking news articles. 
+    Organize the summary by major topics/themes and highlight the most important developments.
+    Keep it informative but concise (2-3 paragraphs).
+
+    News Articles:
+    {context_text}
+
+    Summary:"""
+    
+    response = _get_gemini().generate_content(prompt, request_options={"timeout": GEMINI_SUMMARY_TIMEOUT})
+    return response.text.strip()
+
+def _fallback_summary(k: int) -> Tuple[str, int]:
+    """Simple summary of the k most recent items without Gemini: group similar stories by embedding"""
+    recent_items, rows = recent_embeddings(k)
+    emb = rows.astype(np.float32) / 127
+    labels = _group_by_sim(emb, SIM_GROUP_THRESHOLD)
+    topics = {}
+    for item, label in zip(recent_items, labels):
+        topics.setdefault(int(label), []).append(item)
+    
+    summary_parts = []
+    for items in list(topics.values())[:5]:  # Top 5 topics
+        # Topic label from the cluster leader's title, text from its 2 most recent stories
+        topic = ' '.join(items[0]['title'].split()[:3])
+        summary_parts.append(f"**{topic}**: {' '.join(item['text'] for item in items[-2:])}")
+    
+    return "\n\n".join(summary_parts), len(recent_items)
+
 @app.get("/summary")
-def get_summary():
+async def get_summary():
     """Get AI-generated summary of all latest news"""
-    print(f"🔍 Summary endpoint called - news_index length: {len(news_index)}")
+    recent_items = recent_news(20)  # Get last 20 items for better context
+    print(f"🔍 Summary endpoint called - recent items: {len(recent_items)}")
     
-    if not news_index:
+    if not recent_items:
         return {"summary": "No news articles available yet. Please wait for news to be processed."}
     
-    # Get all recent news items
-    recent_items = news_index[-20:]  # Get last 20 items for better context
+    # Only regenerate when the set of recent items has changed
+    key = hashlib.blake2b(b"\n".join(item['url'].encode("utf-8") for item in recent_items)).hexdigest()
     
     # Create context text for summarization
     context_text = "\n".join([f"• {item['title']}: {item['text']}" for item in recent_items])
     
     try:
-        import google.generativeai as genai
-        genai.configure(api_key=GOOGLE_API_KEY)
-        model_gemini = genai.GenerativeModel("gemini-1.5-flash")
+        if key == _summary_cache["key"] and time.time() - _summary_cache["ts"] < SUMMARY_CACHE_TTL:
+            print("✅ Returning cached Gemini summary")
+            return {"summary": _summary_cache["text"], "article_count": len(recent_items)}
         
-        prompt = f"""Please provide a comprehensive summary of the following breaking news articles. 
-        Organize the summary by major topics/themes and highlight the most important developments.
-        Keep it informative but concise (2-3 paragraphs).
-
-        News Articles:
-        {context_text}
-
-        Summary:"""
+        # Join an in-flight generation for the same items; other keys are never blocked by it
+        task = _summary_inflight.get(key)
+        if task is None:
+            # Blocking Gemini call runs in a worker thread so the event loop keeps serving
+            task = asyncio.ensure_future(asyncio.to_thread(_generate_summary, context_text))
+            _summary_inflight[key] = task
+            task.add_done_callback(lambda _: _summary_inflight.pop(key, None))
         
-        response = model_gemini.generate_content(prompt)
-        summary = response.text.strip()
+        # Shield so one client disconnecting doesn't cancel the call for everyone waiting on it
+        summary = await asyncio.shield(task)
+        _summary_cache.update(key=key, text=summary, ts=time.time())
         
         print(f"✅ Generated summary using Gemini")
         return {"summary": summary, "article_count": len(recent_items)}
         
     except Exception as e:
         print(f"⚠️  Gemini summary failed: {e}")
-        # Fallback to simple summary
-        topics = {}
-        for item in recent_items:
-            # Simple topic extraction (first few words of title)
-            topic = item['title'].split()[:3]
-            topic_key = ' '.join(topic)
-            if topic_key not in topics:
-                topics[topic_key] = []
-            topics[topic_key].append(item['text'])
-        
-        summary_parts = []
-        for topic, articles in list(topics.items())[:5]:  # Top 5 topics
-            summary_parts.append(f"**{topic}**: {' '.join(articles[:2])}")
-        
-        fallback_summary = "\n\n".join(summary_parts)
-        return {"summary": fallback_summary, "article_count": len(recent_items)}
+        # Fallback to simple summary (first call may pay Numba compilation, so keep it off the loop)
+        fallback_summary, article_count = await asyncio.to_thread(_fallback_summary, 20)
+        return {"summary": fallback_summary, "article_count": article_count}
 
 @app.get("/latest")
-def latest():
+async def latest():
     """Get latest REAL-TIME indexed news"""
-    print(f"🔍 Latest endpoint called - news_index length: {len(news_index)}")
-    if not news_index:
+    print(f"🔍 Latest endpoint called - indexed items: {len(_snapshot[1])}")
+    if not _snapshot[1]:
         print("⚠️  No news indexed yet")
-        return []
     
-    # Return most recent 10 items with real-time metadata
-    recent_items = news_index[-10:]
-    print(f"📰 Returning {len(recent_items)} recent items")
-    return recent_items
+    # Most recent 10 items with real-time metadata, serialized when they were indexed
+    return Response(content=_latest_bytes, media_type="application/json")
 
 @app.get("/health")
-def health():
+async def health():
     """Health check with real-time status"""
-    realtime_count = sum(1 for item in news_index if item.get("is_realtime", False))
+    items = _snapshot[1]
+    realtime_count = sum(1 for item in items if item.get("is_realtime", False))
     return {
         "status": "ok", 
-        "indexed_news": len(news_index),
+        "indexed_news": len(items),
         "realtime_news": realtime_count,
         "processing_status": "✅ Real-time processing active",
         "kafka_status": "✅ Available" if KAFKA_AVAILABLE else "❌ Not available",
@@ -796,6 +1054,10 @@ def startup():
     print(f"🤖 Gemini Key: {'✅' if GOOGLE_API_KEY else '❌'}")
     print(f"📡 Kafka: {'✅' if KAFKA_AVAILABLE else '❌'} ({KAFKA_SERVERS})")
     print(f"⚡ Pathway: {'✅' if PATHWAY_AVAILABLE else '❌'} (REAL-TIME streaming pipeline)")
+    print(f"🧠 Embedding device: {device}")
+    
+    # Warm up the embedding model so the first request doesn't pay JIT/autotune costs
+    model.encode(["warmup"], normalize_embeddings=True, convert_to_numpy=True)
     print("🔄 Real-time data processing: ACTIVE")
     
     # Start background threads for continuous real-time processing
@@ -1,52 +1,222 @@
 """
 Example usage of API keys with the installed packages
 """
+import asyncio
+import hashlib
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import orjson
 import requests
-import google.generativeai as genai
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from config import NEWSAPI_KEY, GOOGLE_API_KEY
 
-def test_newsapi():
+# Persistent SQLite response cache is optional
+try:
+    import requests_cache
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    print("⚠️  requests-cache not available - responses will not persist across runs")
+    REQUESTS_CACHE_AVAILABLE = False
+
+# One pooled session shared by all NewsAPI calls, so repeat calls reuse the TLS connection
+if REQUESTS_CACHE_AVAILABLE:
+    # Responses survive restarts and are shared across processes; Cache-Control/ETag are honored
+    _SESSION = requests_cache.CachedSession(
+        ".cache/newsapi",
+        backend="sqlite",
+        expire_after=120,
+        allowable_methods=["GET"],
+        allowable_codes=[200],
+        cache_control=True,
+        # Keep the NewsAPI key out of stored request URLs and cached responses
+        ignored_parameters=["apiKey"],
+    )
+else:
+    _SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    # Back off and retry transient rate-limit/server errors, honoring Retry-After
+    max_retries=Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        allowed_methods=["GET"],
+    ),
+))
+
+# In-memory TTL cache of GET responses: (url, sorted params) -> (fetched_at, data, etag, last_modified)
+_CACHE: dict[tuple, tuple[float, dict, str | None, str | None]] = {}
+
+def _cached_get(url, params, ttl=120):
+    """GET JSON through the pooled session, reusing a response younger than ttl seconds"""
+    key = (url, tuple(sorted(params.items())))
+    entry = _CACHE.get(key)
+    if entry and time.monotonic() - entry[0] < ttl:
+        return entry[1]
+    
+    # Revalidate an expired entry so an unchanged body comes back as a bodiless 304.
+    # A CachedSession already does this itself and never surfaces the 304, so only
+    # the plain Session fallback needs the conditional headers.
+    headers = {}
+    if entry and not REQUESTS_CACHE_AVAILABLE:
+        _, data, etag, last_modified = entry
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+    
+    response = _SESSION.get(url, params=params, headers=headers, timeout=5)
+    if headers and response.status_code == 304:
+        _CACHE[key] = (time.monotonic(), data, etag, last_modified)
+        return data
+    
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+    _CACHE[key] = (time.monotonic(), data, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return data
+
+NEWSAPI_TOP_HEADLINES_URL = "https://newsapi.org/v2/top-headlines"
+
+def fetch_news(queries: list[tuple[str, str]], page_size: int = 100) -> dict[tuple[str, str], list[dict]]:
+    """Fetch top headlines for (country, keyword) queries with one request per country"""
+    keywords_by_country: dict[str, set[str]] = {}
+    for country, keyword in queries:
+        keywords_by_country.setdefault(country, set()).add(keyword)
+    
+    def fetch_country(country):
+        params = {"apiKey": NEWSAPI_KEY, "country": country, "pageSize": page_size}
+        return _cached_get(NEWSAPI_TOP_HEADLINES_URL, params, ttl=120).get("articles", [])
+    
+    # Per-country requests run concurrently over the shared connection pool
+    countries = list(keywords_by_country)
+    with ThreadPoolExecutor(max_workers=min(len(countries), 16) or 1) as pool:
+        articles_by_country = dict(zip(countries, pool.map(fetch_country, countries)))
+    
+    results = {}
+    for country, keywords in keywords_by_country.items():
+        articles = articles_by_country[country]
+        
+        # Split the shared response per keyword client-side ("" matches everything)
+        for keyword in keywords:
+            needle = keyword.lower()
+            results[(country, keyword)] = [
+                article for article in articles
+                if needle in f"{article.get('title') or ''} {article.get('description') or ''}".lower()
+            ]
+    return results
+
+async def test_newsapi():
     """Test NewsAPI functionality"""
     print("Testing NewsAPI...")
-    
-    # Example: Get top headlines
-    url = "https://newsapi.org/v2/top-headlines"
-    params = {
-        "apiKey": NEWSAPI_KEY,
-        "country": "us",
-        "pageSize": 5
-    }
+    if not NEWSAPI_KEY:
+        print("⏭️  Skipping NewsAPI test - NEWSAPI_KEY not set")
+        return
     
     try:
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ NewsAPI working! Found {data['totalResults']} articles")
-            for article in data['articles'][:2]:
-                print(f"  - {article['title']}")
-        else:
-            print(f"❌ NewsAPI error: {response.status_code}")
+        # Example: Get top headlines
+        query = ("us", "")
+        articles = (await asyncio.to_thread(fetch_news, [query], page_size=5))[query]
+        print(f"✅ NewsAPI working! Found {len(articles)} articles")
+        for article in articles[:2]:
+            print(f"  - {article['title']}")
     except Exception as e:
         print(f"❌ NewsAPI error: {e}")
 
-def test_google_ai():
+# Configure Gemini once and share the model across calls
+GEMINI_MODEL_NAME = 'gemini-1.5-flash'
+_MODEL = None
+
+def _get_model():
+    """Import and configure the Gemini SDK on first use (it pulls in grpc/protobuf/google.auth)"""
+    global _MODEL
+    if _MODEL is None:
+        import google.generativeai as genai
+        genai.configure(api_key=GOOGLE_API_KEY)
+        _MODEL = genai.GenerativeModel(GEMINI_MODEL_NAME)
+    return _MODEL
+
+# The smoke test only prints the first 100 characters, so stop decoding early;
+# temperature=0 keeps the response deterministic for the prompt cache
+_SMOKE_TEST_CONFIG = {"max_output_tokens": 32, "temperature": 0}
+
+def _generate_with_retry(model, prompt, generation_config=None, attempts=5):
+    """Call generate_content, backing off with jitter on Gemini rate-limit/unavailable errors"""
+    from google.api_core import exceptions as google_exceptions
+    
+    for attempt in range(attempts):
+        try:
+            return model.generate_content(prompt, generation_config=generation_config)
+        except (google_exceptions.ResourceExhausted, google_exceptions.ServiceUnavailable):
+            if attempt == attempts - 1:
+                raise
+            time.sleep((2 ** attempt) + random.random())
+
+# Gemini responses persisted across runs: sha256(model, config, prompt) -> {prompt, response, ts}
+_GEMINI_CACHE_PATH = Path.home() / ".cache" / "newsflow" / "gemini.json"
+GEMINI_CACHE_TTL = 3600  # seconds; keeps the smoke test contacting Gemini at least hourly
+
+def _load_gemini_cache():
+    try:
+        return orjson.loads(_GEMINI_CACHE_PATH.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+
+_GEMINI_CACHE = _load_gemini_cache()
+
+def _gen(prompt: str) -> tuple[str, bool]:
+    """Generate text for a prompt; returns (text, from_cache), reusing a fresh on-disk entry when present"""
+    key = hashlib.sha256(orjson.dumps(
+        {"model": GEMINI_MODEL_NAME, "config": _SMOKE_TEST_CONFIG, "prompt": prompt},
+        option=orjson.OPT_SORT_KEYS,
+    )).hexdigest()
+    now = time.time()
+    entry = _GEMINI_CACHE.get(key)
+    if entry and now - entry.get("ts", 0) < GEMINI_CACHE_TTL:
+        return entry["response"], True
+    
+    text = _generate_with_retry(_get_model(), prompt, generation_config=_SMOKE_TEST_CONFIG).text
+    
+    # Drop expired entries (including pre-TTL ones without a timestamp) while rewriting the file
+    for stale_key in [k for k, v in _GEMINI_CACHE.items() if now - v.get("ts", 0) >= GEMINI_CACHE_TTL]:
+        del _GEMINI_CACHE[stale_key]
+    _GEMINI_CACHE[key] = {"prompt": prompt, "response": text, "ts": now}
+    try:
+        _GEMINI_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = _GEMINI_CACHE_PATH.with_suffix(".tmp")
+        tmp_path.write_bytes(orjson.dumps(_GEMINI_CACHE))
+        os.replace(tmp_path, _GEMINI_CACHE_PATH)
+    except OSError as e:
+        print(f"⚠️  Could not persist Gemini cache: {e}")
+    return text, False
+
+async def test_google_ai():
     """Test Google Generative AI functionality"""
     print("\nTesting Google Generative AI...")
+    if not GOOGLE_API_KEY:
+        print("⏭️  Skipping Google AI test - GOOGLE_API_KEY not set")
+        return
     
     try:
-        # Configure the API key
-        genai.configure(api_key=GOOGLE_API_KEY)
-        
-        # Initialize the model (updated model name)
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
-        # Generate content
-        response = model.generate_content("Hello, how are you?")
-        print(f"✅ Google AI working! Response: {response.text[:100]}...")
+        # Generate content (the SDK is synchronous, so run it in a thread to overlap with NewsAPI)
+        text, from_cache = await asyncio.to_thread(_gen, "Hello, how are you?")
+        if from_cache:
+            print(f"✅ Google AI response (cached, not re-checked against the API): {text[:100]}...")
+        else:
+            print(f"✅ Google AI working! Response: {text[:100]}...")
         
     except Exception as e:
         print(f"❌ Google AI error: {e}")
 
+async def _main():
+    """Run both independent checks concurrently"""
+    await asyncio.gather(test_newsapi(), test_google_ai(), return_exceptions=True)
+
 if __name__ == "__main__":
-    test_newsapi()
-    test_google_ai()
+    asyncio.run(_main())